@@ -0,0 +1,81 @@
+"""Qt binding selection for table_checkbox.
+
+The binding is taken from the ``QT_API`` environment variable (``pyqt6`` or ``pyside6``). When it is not set, PyQt6 is
+used if it can be imported and PySide6 otherwise. Other values (``QT_API`` is shared with qtpy, matplotlib and others,
+which also accept ``pyqt5`` or ``pyside2``) are treated as unset.
+"""
+
+import os
+import warnings
+
+QT_API = os.environ.get("QT_API", "").lower()
+
+if QT_API not in ("", "pyqt6", "pyside6"):
+    warnings.warn(f"Ignoring unsupported QT_API {QT_API!r}, expected 'pyqt6' or 'pyside6'", RuntimeWarning)
+    QT_API = ""
+
+if QT_API != "pyside6":
+    try:
+        from PyQt6 import QtWidgets
+        from PyQt6.QtCore import (
+            QEvent,
+            QItemSelectionModel,
+            QModelIndex,
+            QPersistentModelIndex,
+            QPoint,
+            QRect,
+            QSignalBlocker,
+            QThread,
+            Qt,
+            pyqtSignal as Signal,
+        )
+        from PyQt6.QtWidgets import (
+            QAbstractItemDelegate,
+            QAbstractItemView,
+            QApplication,
+            QHeaderView,
+            QStyle,
+            QStyledItemDelegate,
+            QStyleOptionButton,
+            QStyleOptionViewItem,
+            QTableWidget,
+            QTableWidgetItem,
+            QTableWidgetSelectionRange,
+            QWidget,
+        )
+
+        QT_API = "pyqt6"
+    except ImportError:
+        if QT_API == "pyqt6":
+            raise
+
+if QT_API != "pyqt6":
+    from PySide6 import QtWidgets
+    from PySide6.QtCore import (
+        QEvent,
+        QItemSelectionModel,
+        QModelIndex,
+        QPersistentModelIndex,
+        QPoint,
+        QRect,
+        QSignalBlocker,
+        QThread,
+        Qt,
+        Signal,
+    )
+    from PySide6.QtWidgets import (
+        QAbstractItemDelegate,
+        QAbstractItemView,
+        QApplication,
+        QHeaderView,
+        QStyle,
+        QStyledItemDelegate,
+        QStyleOptionButton,
+        QStyleOptionViewItem,
+        QTableWidget,
+        QTableWidgetItem,
+        QTableWidgetSelectionRange,
+        QWidget,
+    )
+
+    QT_API = "pyside6"
@@ -0,0 +1,812 @@
+import contextlib
+import itertools
+import threading
+import warnings
+from typing import Iterable, Optional, Union
+
+from _qt_compat import (
+    QAbstractItemDelegate,
+    QAbstractItemView,
+    QApplication,
+    QEvent,
+    QHeaderView,
+    QItemSelectionModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    QPoint,
+    QRect,
+    QSignalBlocker,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
+    QStyleOptionViewItem,
+    QTableWidget,
+    QTableWidgetItem,
+    QTableWidgetSelectionRange,
+    QThread,
+    QWidget,
+    Qt,
+    QtWidgets,
+    Signal,
+)
+
+__version__ = "0.0.1a0"
+
+# Looked up once here instead of through the Qt enums on every toggle and every painted checkbox
+_CHECKED = Qt.CheckState.Checked
+_UNCHECKED = Qt.CheckState.Unchecked
+_CHECK_STATE_ROLE = Qt.ItemDataRole.CheckStateRole
+# Last check state seen by _onItemChanged, stored on each checkbox item
+_LAST_STATE_ROLE = Qt.ItemDataRole.UserRole
+
+
+class NotImplementedWarning(Warning):
+    pass
+
+
+class _CheckBoxHeader(QHeaderView):
+    select_all_clicked = Signal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(Qt.Orientation.Horizontal, parent)
+        self.setSectionsClickable(True)
+        self.isOn = False
+        self.mouseDown = False
+        self.hover_on_checkbox = False
+        self.setMouseTracking(True)
+
+        # Style lookups are cached here and refreshed from changeEvent instead of being repeated on every paint
+        self._option = QStyleOptionButton()
+        self._updateStyleCache()
+        self._updateStateTable()
+
+    def _updateStyleCache(self):
+        self._style = self.style()
+        self._checkboxWidth = self._style.pixelMetric(QStyle.PixelMetric.PM_IndicatorWidth)
+        self._checkboxHeight = self._style.pixelMetric(QStyle.PixelMetric.PM_IndicatorHeight)
+
+    def _updateStateTable(self):
+        # Indexed by (isOn << 2) | (mouseDown << 1) | hover_on_checkbox
+        if self.isEnabled():
+            baseState = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Active
+        else:
+            baseState = QStyle.StateFlag.State_None
+        self._stateTable = []
+        for isOn in (False, True):
+            onState = baseState | (QStyle.StateFlag.State_On if isOn else QStyle.StateFlag.State_Off)
+            self._stateTable += [
+                onState,
+                onState | QStyle.StateFlag.State_MouseOver,
+                onState | QStyle.StateFlag.State_Sunken,
+                onState | QStyle.StateFlag.State_Sunken,
+            ]
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.StyleChange:
+            self._updateStyleCache()
+        elif event.type() == QEvent.Type.EnabledChange:
+            self._updateStateTable()
+        super().changeEvent(event)
+
+    def paintSection(self, painter, rect, logicalIndex):
+        if logicalIndex != 0:
+            # Nothing is drawn on top of these sections, so the painter state does not need to be saved
+            super().paintSection(painter, rect, logicalIndex)
+            return
+
+        painter.save()
+        super().paintSection(painter, rect, logicalIndex)
+        painter.restore()
+        option = self._option
+
+        dx = (rect.width() - self._checkboxWidth) // 2
+        dy = (rect.height() - self._checkboxHeight) // 2
+
+        option.rect = QRect(rect.x() + dx, rect.y() + dy, self._checkboxWidth, self._checkboxHeight)
+        option.state = self._stateTable[(self.isOn << 2) | (self.mouseDown << 1) | self.hover_on_checkbox]
+        self._style.drawControl(QStyle.ControlElement.CE_CheckBox, option, painter)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.mouseDown = False
+            index = self.logicalIndexAt(event.position().toPoint())
+            if index == 0:
+                self.isOn = not self.isOn
+                self.select_all_clicked.emit(self.isOn)
+            self._updateIndicator()
+        super().mouseReleaseEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.mouseDown = True
+            index = self.logicalIndexAt(event.position().toPoint())
+            if index == 0:
+                self._updateIndicator()
+                return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        self._setHover(self._indicatorRect().contains(event.position().toPoint()))
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self._setHover(False)
+        super().leaveEvent(event)
+
+    def setOn(self, isOn):
+        if self.isOn != isOn:
+            self.isOn = isOn
+            self._updateIndicator()
+
+    def _setHover(self, hover):
+        if self.hover_on_checkbox != hover:
+            self.hover_on_checkbox = hover
+            self._updateIndicator()
+
+    def _indicatorRect(self):
+        # Where paintSection puts the checkbox, in viewport coordinates, so that state changes repaint only that area.
+        # Worked out from the current section geometry, since section 0 is not painted while it is scrolled away
+        if self.count() == 0 or self.isSectionHidden(0):
+            return QRect()
+        x = self.sectionViewportPosition(0)
+        width = self.sectionSize(0)
+        if x + width <= 0 or x >= self.viewport().width():
+            return QRect()
+        height = self.viewport().height()
+        return QRect(
+            x + (width - self._checkboxWidth) // 2,
+            (height - self._checkboxHeight) // 2,
+            self._checkboxWidth,
+            self._checkboxHeight,
+        )
+
+    def _updateIndicator(self):
+        rect = self._indicatorRect()
+        if rect.isValid():
+            self.viewport().update(rect)
+        else:
+            self.updateSection(0)
+
+
+class _CheckBoxDelegate(QStyledItemDelegate):
+    """Paints the check state of column 0 as a centered checkbox instead of creating a widget per row."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Like _CheckBoxHeader, keep the indicator size and option object around; the size is looked up again only
+        # when the style used for painting changes
+        self._style = None
+        self._checkboxOption = QStyleOptionButton()
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        if style is not self._style:
+            self._style = style
+            self._checkboxWidth = style.pixelMetric(QStyle.PixelMetric.PM_IndicatorWidth)
+            self._checkboxHeight = style.pixelMetric(QStyle.PixelMetric.PM_IndicatorHeight)
+
+        itemOption = QStyleOptionViewItem(option)
+        self.initStyleOption(itemOption, index)
+        itemOption.features &= ~QStyleOptionViewItem.ViewItemFeature.HasCheckIndicator
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, itemOption, painter, option.widget)
+
+        # Rows inserted without addRows() (the constructor's row count, insertRow(), setRowCount()) have no checkbox
+        checkState = index.data(_CHECK_STATE_ROLE)
+        if checkState is None:
+            return
+
+        checkboxOption = self._checkboxOption
+
+        rect = option.rect
+        dx = (rect.width() - self._checkboxWidth) // 2
+        dy = (rect.height() - self._checkboxHeight) // 2
+
+        checkboxOption.rect = QRect(rect.x() + dx, rect.y() + dy, self._checkboxWidth, self._checkboxHeight)
+        if option.state & QStyle.StateFlag.State_Enabled:
+            checkboxOption.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Active
+        else:
+            checkboxOption.state = QStyle.StateFlag.State_None
+        if Qt.CheckState(checkState) == _CHECKED:
+            checkboxOption.state |= QStyle.StateFlag.State_On
+        else:
+            checkboxOption.state |= QStyle.StateFlag.State_Off
+        style.drawControl(QStyle.ControlElement.CE_CheckBox, checkboxOption, painter)
+
+    def editorEvent(self, event, model, option, index):
+        flags = index.flags()
+        if not (flags & Qt.ItemFlag.ItemIsUserCheckable) or not (flags & Qt.ItemFlag.ItemIsEnabled):
+            return False
+        if event.type() == QEvent.Type.MouseButtonRelease:
+            if event.button() != Qt.MouseButton.LeftButton:
+                return False
+        elif event.type() == QEvent.Type.KeyPress:
+            if event.key() not in (Qt.Key.Key_Space, Qt.Key.Key_Select):
+                return False
+        else:
+            return False
+        checkState = index.data(_CHECK_STATE_ROLE)
+        if checkState is None:
+            return False
+        if Qt.CheckState(checkState) == _CHECKED:
+            state = _UNCHECKED
+        else:
+            state = _CHECKED
+        return model.setData(index, state, _CHECK_STATE_ROLE)
+
+
+class QTableWidgetWithCheckBox(QTableWidget):
+    # Bulk mutations from worker threads go through these signals so that they are queued onto the GUI thread. Calls
+    # from the GUI thread itself run directly, so that their exceptions reach the caller
+    _addRowsRequested = Signal(object, object, object)
+    _checkAllRequested = Signal(bool)
+
+    def __init__(self, rows: int = 0, columns: int = 0, parent: Optional[QWidget] = None, thread_safe: bool = False):
+        """QTableWidget with a checkbox column. The checkbox column is always the first column.
+
+        Like any Qt widget, the table should only be used from the GUI thread. ``addRow``, ``addRows`` and
+        ``checkAll`` may also be called from other threads; they are then carried out later on the GUI thread. Pass
+        ``thread_safe=True`` to guard the other public methods with a lock if they are called from other threads too.
+        """
+        super().__init__(rows, columns + 1, parent)
+        self.super = super()
+
+        self._header = _CheckBoxHeader()
+        self.super.setHorizontalHeader(self._header)
+        # Column 0 only ever holds a checkbox, so give it a fixed width instead of measuring every row on each change
+        self._header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
+        self._resizeCheckBoxColumn()
+        self._header.select_all_clicked.connect(self.checkAll)
+        self._addRowsRequested.connect(self._onAddRowsRequested)
+        self._checkAllRequested.connect(self._checkAll)
+        self.super.setItemDelegateForColumn(0, _CheckBoxDelegate(self))
+        # Counters must be updated before onCheckboxStateChanged refreshes the header, so connect this slot first
+        self.itemChanged.connect(self._onItemChanged)
+        self.itemChanged.connect(self.onCheckboxStateChanged)
+        self.super.model().rowsAboutToBeRemoved.connect(self._onRowsAboutToBeRemoved)
+        # Selected rows are cached for the cascade and dropped whenever the selection or the row order changes
+        self.super.selectionModel().selectionChanged.connect(self._invalidateSelectedRows)
+        self.super.model().rowsInserted.connect(self._invalidateSelectedRows)
+        self.super.model().rowsRemoved.connect(self._invalidateSelectedRows)
+        self.super.model().layoutChanged.connect(self._invalidateSelectedRows)
+        self.super.model().modelReset.connect(self._invalidateSelectedRows)
+
+        # _lock only guards the public methods and is a no-op unless thread_safe is set. The slots below are
+        # always invoked on the thread that changed the item, so they use a plain flag to stop the cascade from
+        # re-entering itself.
+        self._lock = threading.RLock() if thread_safe else contextlib.nullcontext()
+        self._in_cascade = False
+        self._selected_rows = None  # type: Optional[set[int]]
+        self._press_index = QModelIndex()
+        self._unchecked_count = 0
+        self._row_count_tracked = 0
+
+    # Reimplement QTableWidget functions
+
+    def cellWidget(self, row: int, column: int) -> QWidget:
+        return self.super.cellWidget(row, column + 1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.super.setUpdatesEnabled(False)
+            try:
+                self.super.setColumnCount(1)
+                self.super.setRowCount(0)
+            finally:
+                self.super.setUpdatesEnabled(True)
+
+    def clearContents(self) -> None:
+        with self._lock:
+            self.super.setUpdatesEnabled(False)
+            try:
+                # Keep the checkbox items (and their states) out of the way of the native bulk clear
+                checkboxes = [self.super.takeItem(row, 0) for row in range(self.super.rowCount())]
+                self.super.clearContents()
+                for row, checkbox in enumerate(checkboxes):
+                    if checkbox is not None:
+                        self.super.setItem(row, 0, checkbox)
+            finally:
+                self.super.setUpdatesEnabled(True)
+
+    def column(self, column: Optional[QTableWidgetItem]) -> int:
+        return self.super.column(column) - 1
+
+    def columnCount(self) -> int:
+        return self.super.columnCount() - 1
+
+    def currentColumn(self) -> int:
+        return self.super.currentColumn() - 1
+
+    def horizontalHeaderItem(self, column: int) -> QTableWidgetItem:
+        return self.super.horizontalHeaderItem(column + 1)
+
+    def indexFromItem(self, item: Optional[QTableWidgetItem]) -> QModelIndex:
+        warnings.warn("indexFromItem() is not overridden", NotImplementedWarning)
+        return self.super.indexFromItem(item)
+
+    def insertColumn(self, column: int) -> None:
+        self.super.insertColumn(column + 1)
+
+    def item(self, row: int, column: int) -> QTableWidgetItem:
+        return self.super.item(row, column + 1)
+
+    def itemAt(  # type: ignore[override]
+        self, _arg0: Union[QPoint, int], _arg1: Optional[int] = None
+    ) -> Union[QTableWidgetItem, None]:
+        """
+        ```Python
+        @overload
+        def itemAt(self, pos: QPoint) -> Union[QTableWidgetItem, None]:
+            ...
+
+        @overload
+        def itemAt(self, x: int, y: int) -> Union[QTableWidgetItem, None]:
+            ...
+        ```
+        """
+        if _arg1 is None:
+            if isinstance(_arg0, QPoint):
+                x, y = _arg0.x(), _arg0.y()
+            else:
+                raise TypeError("itemAt() requires a QPoint or two integers")
+        else:
+            if isinstance(_arg0, int) and isinstance(_arg1, int):
+                x, y = _arg0, _arg1
+            else:
+                raise TypeError("itemAt() requires a QPoint or two integers")
+        item = self.super.itemAt(x, y)
+        if item is not None and item.column() == 0:
+            return None
+        return item
+
+    def itemFromIndex(self, index: Union[QModelIndex, QPersistentModelIndex]) -> QTableWidgetItem:
+        warnings.warn("itemFromIndex() is not overridden", NotImplementedWarning)
+        return self.super.itemFromIndex(index)
+
+    def removeCellWidget(self, row: int, column: int) -> None:
+        self.super.removeCellWidget(row, column + 1)
+
+    def removeColumn(self, column: int) -> None:
+        self.super.removeColumn(column + 1)
+
+    def removeRow(self, row: int) -> None:
+        with self._lock:
+            self.super.removeRow(row)
+
+    def selectedRanges(self) -> list[QTableWidgetSelectionRange]:
+        return [
+            QTableWidgetSelectionRange(
+                selected_range.topRow(),
+                max(selected_range.leftColumn() - 1, 0),
+                selected_range.bottomRow(),
+                selected_range.rightColumn() - 1,
+            )
+            for selected_range in self.super.selectedRanges()
+        ]
+
+    def setCellWidget(self, row: int, column: int, widget: Optional[QWidget]) -> None:
+        self.super.setCellWidget(row, column + 1, widget)
+
+    def setColumnCount(self, columns: int) -> None:
+        self.super.setColumnCount(columns + 1)
+
+    def setCurrentCell(
+        self,
+        _arg0: Union[int, QTableWidgetItem],
+        _arg1: Optional[Union[int, QItemSelectionModel.SelectionFlag]] = None,
+        _arg2: Optional[QItemSelectionModel.SelectionFlag] = None,
+    ) -> None:
+        """
+        ```Python
+        @overload
+        def setCurrentCell(self, row: int, column: int) -> None:
+            ...
+
+        @overload
+        def setCurrentCell(self, row: int, column: int, command: QItemSelectionModel.SelectionFlag) -> None:
+            ...
+
+        @overload
+        def setCurrentItem(self, item: QTableWidgetItem) -> None:
+            ...
+
+        @overload
+        def setCurrentItem(self, item: QTableWidgetItem, command: QItemSelectionModel.SelectionFlag) -> None:
+            ...
+        ```
+        """
+        if _arg1 is None:
+            if isinstance(_arg0, QTableWidgetItem):
+                return self.super.setCurrentCell(_arg0)
+        elif _arg2 is None:
+            if isinstance(_arg0, int) and isinstance(_arg1, int):
+                return self.super.setCurrentCell(_arg0, _arg1 + 1)
+            elif isinstance(_arg0, QTableWidgetItem) and isinstance(_arg1, QItemSelectionModel.SelectionFlag):
+                return self.super.setCurrentCell(_arg0, _arg1)
+        elif isinstance(_arg0, int) and isinstance(_arg1, int) and isinstance(_arg2, QItemSelectionModel.SelectionFlag):
+            return self.super.setCurrentCell(_arg0, _arg1 + 1, _arg2)
+        return self.super.setCurrentCell(_arg0, _arg1, _arg2)  # This will raise an error!
+
+    def setHorizontalHeaderItem(self, column: int, item: Optional[QTableWidgetItem]) -> None:
+        self.super.setHorizontalHeaderItem(column + 1, item)
+
+    def setItem(self, row: int, column: int, item: Optional[QTableWidgetItem]) -> None:
+        self.super.setItem(row, column + 1, item)
+
+    def setHorizontalHeaderLabels(self, labels: Iterable[Optional[str]]) -> None:
+        with self._lock:
+            self.super.setHorizontalHeaderLabels(list(itertools.chain(("",), labels)))
+
+    def setRangeSelected(self, range: QTableWidgetSelectionRange, select: bool) -> None:
+        self.super.setRangeSelected(
+            QTableWidgetSelectionRange(
+                range.topRow(), range.leftColumn() + 1, range.bottomRow(), range.rightColumn() + 1
+            ),
+            select,
+        )
+
+    def sortItems(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        self.super.sortItems(column + 1, order)
+
+    def takeItem(self, row: int, column: int) -> QTableWidgetItem:
+        return self.super.takeItem(row, column + 1)
+
+    def takeHorizontalHeaderItem(self, column: int) -> QTableWidgetItem:
+        return self.super.takeHorizontalHeaderItem(column + 1)
+
+    def visualColumn(self, column: int) -> int:
+        return self.super.visualColumn(column + 1)
+
+    # Reimplement QTableView functions
+
+    def clearSpans(self) -> None:
+        self.clear()
+
+    def columnAt(self, x: int) -> int:
+        return self.super.columnAt(x + 1)
+
+    def columnSpan(self, row: int, column: int) -> int:
+        return self.super.columnSpan(row, column + 1)
+
+    def columnViewportPosition(self, column: int) -> int:
+        return self.super.columnViewportPosition(column + 1)
+
+    def columnWidth(self, column: int) -> int:
+        return self.super.columnWidth(column + 1)
+
+    def hideColumn(self, column: int) -> None:
+        self.super.hideColumn(column + 1)
+
+    def isColumnHidden(self, column: int) -> bool:
+        return self.super.isColumnHidden(column + 1)
+
+    def isIndexHidden(self, index: Union[QModelIndex, QPersistentModelIndex]) -> bool:
+        warnings.warn("isIndexHidden() is not overridden", NotImplementedWarning)
+        return self.super.isIndexHidden(index)
+
+    def resizeColumnToContents(self, column: int) -> None:
+        self.super.resizeColumnToContents(column + 1)
+
+    def rowSpan(self, row: int, column: int) -> int:
+        return self.super.rowSpan(row, column + 1)
+
+    def scrollTo(
+        self,
+        index: Union[QModelIndex, QPersistentModelIndex],
+        hint: QAbstractItemView.ScrollHint = QAbstractItemView.ScrollHint.EnsureVisible,
+    ) -> None:
+        warnings.warn("scrollTo() is not overridden", NotImplementedWarning)
+        return self.super.scrollTo(index, hint)
+
+    def selectColumn(self, column: int) -> None:
+        self.super.selectColumn(column + 1)
+
+    def selectedIndexes(self) -> list[QModelIndex]:
+        warnings.warn("selectedIndexes() is not overridden", NotImplementedWarning)
+        return self.super.selectedIndexes()
+
+    def setColumnHidden(self, column: int, hide: bool) -> None:
+        self.super.setColumnHidden(column + 1, hide)
+
+    def setColumnWidth(self, column: int, width: int) -> None:
+        self.super.setColumnWidth(column + 1, width)
+
+    def setSpan(self, row: int, column: int, rowSpan: int, columnSpan: int) -> None:
+        self.super.setSpan(row, column + 1, rowSpan, columnSpan)
+
+    def showColumn(self, column: int) -> None:
+        self.super.showColumn(column + 1)
+
+    def sizeHintForColumn(self, column: int) -> int:
+        warnings.warn("sizeHintForColumn() is not overridden", NotImplementedWarning)
+        return self.super.sizeHintForColumn(column)
+
+    def sortByColumn(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        self.super.sortByColumn(column + 1, order)
+
+    # Reimplement QAbstractItemView functions
+
+    def indexAt(self, point: QPoint) -> QModelIndex:
+        warnings.warn("indexAt() is not overridden", NotImplementedWarning)
+        return self.super.indexAt(point)
+
+    def setItemDelegateForColumn(self, column: int, delegate: Optional[QAbstractItemDelegate]) -> None:
+        self.super.setItemDelegateForColumn(column + 1, delegate)
+
+    # More functions for QTableWidgetWithCheckBox
+
+    def addRow(self, items: Iterable, state: bool = False, row: Optional[int] = None) -> None:
+        self.addRows([items], [state], row)
+
+    def addRows(
+        self, rows: Iterable[Iterable], states: Optional[Iterable[bool]] = None, row: Optional[int] = None
+    ) -> None:
+        """Insert several rows at once, at ``row`` or at the end. Sorting and repainting are suspended while the
+        items are filled in and the header is checked only once.
+
+        Row heights are not measured here. For large tables keep the vertical header in ``Fixed`` mode, or call
+        ``resizeRowsToContents()`` once after adding the rows instead of using ``ResizeToContents``.
+        """
+        # Build every item here so that bad input fails in the caller, before any row is inserted or the insertion is
+        # queued. QTableWidgetItem is not a QObject, so creating it on a worker thread is fine
+        rows = [
+            [
+                (
+                    item
+                    if isinstance(item, QTableWidgetItem)
+                    else QTableWidgetItem(item if isinstance(item, str) else str(item))
+                )
+                for item in items
+            ]
+            for items in rows
+        ]
+        if states is None:
+            states = [False] * len(rows)
+        else:
+            states = list(states)
+            if len(states) != len(rows):
+                raise ValueError("addRows() requires as many states as rows")
+        if not rows:
+            return
+        # The row count is only read on the GUI thread, so an out-of-range row is detected in _addRows
+        if QThread.currentThread() is self.thread():
+            if not self._addRows(rows, states, row):
+                raise IndexError(f"Row {row} is out of range")
+        else:
+            self._addRowsRequested.emit(rows, states, row)
+
+    def _onAddRowsRequested(self, rows: list, states: list, row: Optional[int]) -> None:
+        # Raising here would only reach Qt's slot handling, which aborts the process under PyQt6
+        if not self._addRows(rows, states, row):
+            warnings.warn(f"Rows queued for row {row} were dropped: row is out of range", RuntimeWarning)
+
+    def _addRows(self, rows: list, states: list, row: Optional[int]) -> bool:
+        with self._lock:
+            if row is None:
+                row = self.super.rowCount()
+
+            sortingEnabled = self.super.isSortingEnabled()
+            self.super.setSortingEnabled(False)
+            self.super.setUpdatesEnabled(False)
+            # Every setItem() below emits itemChanged, but new rows never start a cascade, so skip the handler. Restore
+            # the previous flag in case addRows() was called from a slot in the middle of one
+            inCascade = self._in_cascade
+            self._in_cascade = True
+            try:
+                # insertRows() refuses rows outside 0 <= row <= rowCount(), before any checkbox item is counted
+                if not self.super.model().insertRows(row, len(rows)):
+                    return False
+                setItem = self.super.setItem
+                for row, (items, state) in enumerate(zip(rows, states), row):
+                    setItem(row, 0, self._newCheckBoxItem(state))
+                    for i, item in enumerate(items):
+                        setItem(row, i + 1, item)
+                return True
+            finally:
+                self._in_cascade = inCascade
+                self.super.setSortingEnabled(sortingEnabled)
+                self.super.setUpdatesEnabled(True)
+                self._checkHeader()
+
+    def getCheckState(self, row: int) -> Union[bool, None]:
+        with self._lock:
+            checkbox = self.super.item(row, 0)
+            if checkbox is not None:
+                return checkbox.checkState() == _CHECKED
+            return None
+
+    def getCheckedRows(self) -> list[int]:
+        """Return the checked rows in ascending order."""
+        with self._lock:
+            rowCount = self.super.rowCount()
+            if self._row_count_tracked == rowCount:
+                # Every row has a checkbox, so the counters answer the all/none cases without touching the items
+                if self._unchecked_count == 0:
+                    return list(range(rowCount))
+                if self._unchecked_count == rowCount:
+                    return []
+            model = self.super.model()
+            matches = model.match(
+                model.index(0, 0),
+                _CHECK_STATE_ROLE,
+                _CHECKED.value,
+                -1,
+                Qt.MatchFlag.MatchExactly,
+            )
+            return [index.row() for index in matches]
+
+    def getAllCheckStates(self) -> list[Union[bool, None]]:
+        """Return the check state of every row, ``None`` for rows without a checkbox."""
+        with self._lock:
+            rowCount = self.super.rowCount()
+            if self._row_count_tracked == rowCount:
+                if self._unchecked_count == 0:
+                    return [True] * rowCount
+                if self._unchecked_count == rowCount:
+                    return [False] * rowCount
+            item = self.super.item
+            states = []
+            for row in range(rowCount):
+                checkbox = item(row, 0)
+                states.append(checkbox.checkState() == _CHECKED if checkbox is not None else None)
+            return states
+
+    def setCheckState(self, row: int, state: bool) -> None:
+        with self._lock:
+            checkbox = self.super.item(row, 0)
+            if checkbox is not None:
+                checkbox.setCheckState(_CHECKED if state else _UNCHECKED)
+                self._checkHeader()
+
+    def checkAll(self, isOn: bool) -> None:
+        if QThread.currentThread() is self.thread():
+            self._checkAll(isOn)
+        else:
+            self._checkAllRequested.emit(isOn)
+
+    def _checkAll(self, isOn: bool) -> None:
+        with self._lock:
+            state = _CHECKED if isOn else _UNCHECKED
+            rowCount = self.super.rowCount()
+            model = self.super.model()
+            # Every row ends up in the same state, so silence the per-item notifications, fix the counters up once
+            # and announce the whole column with a single dataChanged
+            with QSignalBlocker(model):
+                for row in range(rowCount):
+                    checkbox = self.super.item(row, 0)
+                    if checkbox is not None:
+                        checkbox.setCheckState(state)
+                        if checkbox.data(_LAST_STATE_ROLE) is not None:
+                            checkbox.setData(_LAST_STATE_ROLE, bool(isOn))
+            self._unchecked_count = 0 if isOn else self._row_count_tracked
+            if rowCount:
+                # QTableWidget turns this into an itemChanged for the first row, which must not start a cascade.
+                # Restore the previous flag in case checkAll() was called from a slot in the middle of one
+                inCascade = self._in_cascade
+                self._in_cascade = True
+                try:
+                    model.dataChanged.emit(
+                        model.index(0, 0), model.index(rowCount - 1, 0), [_CHECK_STATE_ROLE.value]
+                    )
+                finally:
+                    self._in_cascade = inCascade
+            self._checkHeader()
+
+    def onCheckboxStateChanged(self, item: QTableWidgetItem) -> None:
+        if item.column() != 0 or self._in_cascade:
+            return
+        self._in_cascade = True
+        try:
+            if self._selected_rows is None:
+                self._selected_rows = {i.row() for i in self.super.selectedIndexes()}
+            selected_rows = self._selected_rows
+            if item.row() in selected_rows:
+                state = item.checkState()
+                for selected_row in selected_rows:
+                    checkbox = self.super.item(selected_row, 0)
+                    if checkbox is not None:
+                        checkbox.setCheckState(state)
+
+            self._checkHeader()
+        finally:
+            self._in_cascade = False
+
+    def _invalidateSelectedRows(self, *args) -> None:
+        self._selected_rows = None
+
+    def _newCheckBoxItem(self, state: bool) -> QTableWidgetItem:
+        checkbox = QTableWidgetItem()
+        checkbox.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
+        if state:
+            checkbox.setCheckState(_CHECKED)
+        else:
+            checkbox.setCheckState(_UNCHECKED)
+            self._unchecked_count += 1
+        checkbox.setData(_LAST_STATE_ROLE, bool(state))
+        self._row_count_tracked += 1
+        return checkbox
+
+    def _onItemChanged(self, item: QTableWidgetItem) -> None:
+        if item.column() != 0:
+            return
+        # The last known state is kept in UserRole so that only real transitions touch the counter
+        wasChecked = item.data(_LAST_STATE_ROLE)
+        if wasChecked is None:
+            return
+        isChecked = item.checkState() == _CHECKED
+        if isChecked == wasChecked:
+            return
+        self._unchecked_count += -1 if isChecked else 1
+        with QSignalBlocker(self.super.model()):
+            item.setData(_LAST_STATE_ROLE, isChecked)
+
+    def _onRowsAboutToBeRemoved(self, parent: QModelIndex, first: int, last: int) -> None:
+        for row in range(first, last + 1):
+            checkbox = self.super.item(row, 0)
+            if checkbox is None:
+                continue
+            wasChecked = checkbox.data(_LAST_STATE_ROLE)
+            if wasChecked is None:
+                continue
+            self._row_count_tracked -= 1
+            if not wasChecked:
+                self._unchecked_count -= 1
+        self._checkHeader()
+
+    def _checkHeader(self) -> None:
+        self._header.setOn(self._unchecked_count == 0 and self._row_count_tracked > 0)
+
+    def _resizeCheckBoxColumn(self) -> None:
+        style = self.style()
+        width = style.pixelMetric(QStyle.PixelMetric.PM_IndicatorWidth)
+        width += 2 * style.pixelMetric(QStyle.PixelMetric.PM_LayoutLeftMargin)
+        self._header.resizeSection(0, width)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.StyleChange:
+            self._resizeCheckBoxColumn()
+        self.super.changeEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._press_index = self.super.indexAt(event.position().toPoint())
+        if self._press_index.column() != 0:
+            self.super.mousePressEvent(event)
+        else:
+            event.ignore()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton:
+            self.super.mouseReleaseEvent(event)
+            return
+        index = self.super.indexAt(event.position().toPoint())
+        # The press was not forwarded to keep the selection, so hand the release to the delegate directly
+        if (
+            index.column() == 0
+            and index == self._press_index
+            and self.super.edit(index, QAbstractItemView.EditTrigger.NoEditTriggers, event)
+        ):
+            event.ignore()
+        else:
+            self.super.mouseReleaseEvent(event)
+
+
+if __name__ == "__main__":
+
+    class MainWindow(QtWidgets.QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.table_widget = QTableWidgetWithCheckBox(0, 3)
+
+            self.table_widget.addRows([f"Item {i}-{j}" for j in range(3)] for i in range(5))
+
+            self.table_widget.setHorizontalHeaderLabels([f"Column {i}" for i in range(self.table_widget.columnCount())])
+            self.table_widget.setSortingEnabled(True)
+            self.table_widget.resizeRowsToContents()
+
+            self.setCentralWidget(self.table_widget)
+
+    app = QApplication([])
+    window = MainWindow()
+    window.show()
+    app.exec()